@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""Assemble the memory context that Claude Code hooks inject into a session.
+
+Replaces ``cat 0-System/status.md`` in ``.claude/settings.local.json``. The
+memory files (status.md, context.md, optionally about-me/) are fitted into a
+token budget: status.md first, the newest ``### Day`` snapshots of context.md
+in full, older days shortened to a one-line summary. The assembled blocks are
+cached in ``.context-cache.json`` keyed on file mtimes/sizes, so an unchanged
+memory directory costs a few ``stat`` calls instead of a re-read.
+
+Claude Code passes the hook payload as JSON on stdin. Within one session
+(``session_id``) only the blocks that changed since the last injection are
+printed, and nothing at all when nothing changed. ``SessionStart`` (startup,
+resume, /clear, compaction) always gets the full context.
+
+Usage (from the project root):
+    python3 0-System/scripts/inject_context.py [--budget 4000] [--about-me]
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import re
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+DEFAULT_ROOT = Path(__file__).resolve().parent.parent
+CACHE_NAME = ".context-cache.json"
+CACHE_VERSION = 1
+MAX_SESSIONS = 20
+MIN_TRUNCATED_TOKENS = 40
+TRUNCATED = "…（已截断）"
+
+DAY_HEADING = re.compile(r"^### Day\b.*$", re.M)
+SECTION_HEADING = re.compile(r"^#{2,3} ", re.M)
+HTML_COMMENT = re.compile(r"<!--.*?-->", re.S)
+CJK = re.compile(r"[\u2e80-\u9fff\uac00-\ud7af\uf900-\ufaff\uff00-\uffef]")
+
+
+@dataclass(frozen=True)
+class Block:
+    """One injectable piece of memory, e.g. ``context.md#Day 3 - 02/05``."""
+
+    id: str
+    text: str
+
+    @property
+    def source(self) -> str:
+        return self.id.split("#", 1)[0]
+
+    @property
+    def digest(self) -> str:
+        return hashlib.sha256(self.text.encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass(frozen=True)
+class Options:
+    budget: int = 4000
+    full_days: int = 2
+    summary_chars: int = 120
+    about_me: bool = False
+    context: bool = True
+
+    def key(self) -> list:
+        return [self.budget, self.full_days, self.summary_chars, self.about_me, self.context]
+
+
+# --- token budget ----------------------------------------------------------
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count: one per CJK character, one per 4 other characters."""
+    cjk = len(CJK.findall(text))
+    return cjk + math.ceil((len(text) - cjk) / 4)
+
+
+def truncate_to_tokens(text: str, budget: int) -> str:
+    """Cut ``text`` at a line boundary so that it fits ``budget`` tokens."""
+    if estimate_tokens(text) <= budget:
+        return text
+    budget -= estimate_tokens(TRUNCATED)
+    kept: list[str] = []
+    used = 0
+    for line in text.splitlines():
+        cost = estimate_tokens(line) + 1
+        if used + cost > budget:
+            break
+        kept.append(line)
+        used += cost
+    return "\n".join(kept + [TRUNCATED])
+
+
+# --- parsing ---------------------------------------------------------------
+
+
+def clean(text: str) -> str:
+    """Drop template comments and collapse runs of blank lines."""
+    text = HTML_COMMENT.sub("", text)
+    text = re.sub(r"\n{3,}", "\n\n", text)
+    return text.strip()
+
+
+def split_context(text: str) -> tuple[str, list[str], str]:
+    """Split context.md into (head, day sections oldest first, tail)."""
+    starts = [m.start() for m in DAY_HEADING.finditer(text)]
+    if not starts:
+        return text, [], ""
+    days = []
+    end = len(text)
+    for i, start in enumerate(starts):
+        nxt = SECTION_HEADING.search(text, start + 1)
+        end = nxt.start() if nxt else len(text)
+        if i + 1 < len(starts):
+            end = min(end, starts[i + 1])
+        days.append(text[start:end])
+    return text[: starts[0]], days, text[end:]
+
+
+def summarize_day(day: str, max_chars: int) -> str:
+    """Heading plus the first ``max_chars`` characters of the body on one line."""
+    lines = day.strip().splitlines()
+    body = " ".join(
+        line.strip() for line in lines[1:] if line.strip() and line.strip() != "---"
+    )
+    if len(body) > max_chars:
+        body = body[:max_chars].rstrip() + "…"
+    return f"{lines[0]}\n{body}" if body else lines[0]
+
+
+def strip_separator(text: str) -> str:
+    return re.sub(r"(\s*---\s*)+$", "", clean(text))
+
+
+# --- assembly --------------------------------------------------------------
+
+
+def source_files(root: Path, opts: Options) -> list[Path]:
+    files = [root / "status.md"]
+    if opts.context:
+        files.append(root / "context.md")
+    if opts.about_me and (root / "about-me").is_dir():
+        files += sorted(
+            p for p in (root / "about-me").glob("*.md") if p.name.lower() != "readme.md"
+        )
+    return [p for p in files if p.is_file()]
+
+
+def cache_key(root: Path, files: list[Path], opts: Options) -> list:
+    stats = []
+    for path in files:
+        st = path.stat()
+        stats.append([path.relative_to(root).as_posix(), st.st_mtime_ns, st.st_size])
+    return [opts.key(), stats]
+
+
+def assemble(root: Path, files: list[Path], opts: Options) -> list[Block]:
+    """Read the memory files and fit them into ``opts.budget``.
+
+    Blocks are picked greedily by priority (status.md, newest days, about-me,
+    the context.md header, older day summaries, the rest of context.md); the
+    first block that does not fit is truncated and everything after it is
+    dropped. The result is in reading order.
+    """
+    # (priority, block) in reading order
+    candidates: list[tuple[tuple[int, int], Block]] = []
+    for path in files:
+        rel = path.relative_to(root).as_posix()
+        text = path.read_text(encoding="utf-8", errors="replace")
+        if rel != "context.md":
+            priority = 0 if rel == "status.md" else 2
+            candidates.append(((priority, 0), Block(rel, clean(text))))
+            continue
+        head, days, tail = split_context(text)
+        candidates.append(((3, 0), Block(f"{rel}#head", strip_separator(head))))
+        for i, day in enumerate(days):
+            age = len(days) - 1 - i  # 0 = newest
+            title = day.splitlines()[0].lstrip("# ").strip()
+            if any(c[1].id == f"{rel}#{title}" for c in candidates):
+                title = f"{title} ({i + 1})"  # keep ids unique for the delta
+            if age < opts.full_days:
+                block = Block(f"{rel}#{title}", strip_separator(day))
+                candidates.append(((1, age), block))
+            else:
+                block = Block(f"{rel}#{title}", summarize_day(clean(day), opts.summary_chars))
+                candidates.append(((4, age), block))
+        candidates.append(((5, 0), Block(f"{rel}#tail", strip_separator(tail))))
+
+    remaining = opts.budget
+    chosen: dict[str, Block] = {}
+    for _, block in sorted(candidates, key=lambda c: c[0]):
+        if not block.text:
+            continue
+        cost = estimate_tokens(block.text)
+        if cost <= remaining:
+            chosen[block.id] = block
+            remaining -= cost
+        else:
+            if remaining >= MIN_TRUNCATED_TOKENS:
+                chosen[block.id] = Block(block.id, truncate_to_tokens(block.text, remaining))
+            break
+    return [chosen[b.id] for _, b in candidates if b.id in chosen]
+
+
+def render(blocks: list[Block], delta: bool = False) -> str:
+    """Join blocks under one ``=== 0-System/<file> ===`` header per file."""
+    if not blocks:
+        return ""
+    parts: list[str] = []
+    if delta:
+        parts.append("[memory] 以下是自上次注入以来有变化的部分，其余记忆见上文。")
+    source = None
+    for block in blocks:
+        if block.source != source:
+            source = block.source
+            parts.append(f"=== 0-System/{source} ===\n{block.text}")
+        else:
+            parts.append(block.text)
+    return "\n\n".join(parts) + "\n"
+
+
+# --- cache / sessions ------------------------------------------------------
+
+
+def load_cache(path: Path) -> dict:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if data.get("version") == CACHE_VERSION else {}
+
+
+def save_cache(path: Path, data: dict) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError:
+        pass  # a read-only tree just means no caching
+
+
+def read_hook_input() -> dict:
+    if sys.stdin is None or sys.stdin.isatty():
+        return {}
+    try:
+        data = json.loads(sys.stdin.read() or "{}")
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def build_output(root: Path, opts: Options, hook: dict, cache_path: Path, full: bool = False) -> str:
+    files = source_files(root, opts)
+    key = cache_key(root, files, opts)
+    cache = load_cache(cache_path)
+
+    if cache.get("key") == key:
+        blocks = [Block(i, t) for i, t in cache["blocks"]]
+    else:
+        blocks = assemble(root, files, opts)
+
+    sessions: dict = cache.get("sessions", {})
+    session_id = hook.get("session_id")
+    current = {b.id: b.digest for b in blocks}
+    seen = sessions.pop(session_id, None) if session_id else None
+
+    if full or seen is None or hook.get("hook_event_name") == "SessionStart":
+        output = render(blocks)
+    elif set(seen) - set(current):
+        output = render(blocks)  # something was removed: resend everything
+    else:
+        changed = [b for b in blocks if seen.get(b.id) != b.digest]
+        output = render(changed, delta=True)
+
+    if session_id:
+        sessions[session_id] = current
+        while len(sessions) > MAX_SESSIONS:
+            sessions.pop(next(iter(sessions)))
+    if session_id or cache.get("key") != key:
+        save_cache(
+            cache_path,
+            {
+                "version": CACHE_VERSION,
+                "key": key,
+                "blocks": [[b.id, b.text] for b in blocks],
+                "sessions": sessions,
+            },
+        )
+    return output
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--root", type=Path, default=DEFAULT_ROOT, help="memory directory (default: 0-System)")
+    parser.add_argument("--budget", type=int, default=Options.budget, help="token budget (default: %(default)s)")
+    parser.add_argument("--full-days", type=int, default=Options.full_days, help="newest context.md days kept in full (default: %(default)s)")
+    parser.add_argument("--summary-chars", type=int, default=Options.summary_chars, help="summary length of older days (default: %(default)s)")
+    parser.add_argument("--about-me", action="store_true", help="also inject about-me/*.md")
+    parser.add_argument("--no-context", action="store_true", help="skip context.md")
+    parser.add_argument("--full", action="store_true", help="always print the full context, never a delta")
+    parser.add_argument("--cache", type=Path, help=f"cache file (default: <root>/{CACHE_NAME})")
+    args = parser.parse_args(argv)
+
+    opts = Options(
+        budget=args.budget,
+        full_days=args.full_days,
+        summary_chars=args.summary_chars,
+        about_me=args.about_me,
+        context=not args.no_context,
+    )
+    root = args.root.resolve()
+    cache_path = args.cache or root / CACHE_NAME
+    output = build_output(root, opts, read_hook_input(), cache_path, full=args.full)
+
+    if hasattr(sys.stdout, "reconfigure"):
+        sys.stdout.reconfigure(encoding="utf-8")  # Windows consoles default to GBK
+    sys.stdout.write(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+import inject_context as ic
+
+EXAMPLES = Path(__file__).resolve().parent.parent
+
+DAYS = """# Context（中期记忆）
+
+## 本周概览
+
+**本周重点**：上线 mycc
+
+---
+
+## 每日快照
+
+### Day 1 - 02/02（周一）
+
+**做了什么**：
+- 修复 hooks 在 Windows 上的报错
+- 整理 skills 清单
+
+---
+
+### Day 2 - 02/03（周二）
+
+**做了什么**：
+- 飞书通道联调
+
+---
+
+### Day 3 - 02/04（周三）
+
+**做了什么**：
+- 启动脚本改为等待就绪
+
+---
+
+## 周末回顾
+
+**本周完成**：
+-
+"""
+
+
+@pytest.fixture
+def memory(tmp_path):
+    (tmp_path / "status.md").write_text("# Status\n\n- 今天在写 context 注入\n", encoding="utf-8")
+    (tmp_path / "context.md").write_text(DAYS, encoding="utf-8")
+    return tmp_path
+
+
+def run(root, opts=None, hook=None, full=False):
+    return ic.build_output(
+        root, opts or ic.Options(), hook or {}, root / ic.CACHE_NAME, full=full
+    )
+
+
+def test_estimate_tokens_counts_cjk_per_character():
+    assert ic.estimate_tokens("abcdefgh") == 2
+    assert ic.estimate_tokens("记忆系统") == 4
+    assert ic.estimate_tokens("") == 0
+
+
+def test_split_context_on_shipped_example():
+    text = (EXAMPLES / "context.md.example").read_text(encoding="utf-8")
+    head, days, tail = ic.split_context(text)
+    assert "本周概览" in head
+    assert [d.splitlines()[0] for d in days] == [
+        "### Day 1 - MM/DD（周X）",
+        "### Day 2 - MM/DD（周X）",
+    ]
+    assert tail.startswith("## 周末回顾")
+
+
+def test_newest_days_in_full_older_days_summarized(memory):
+    out = run(memory, ic.Options(full_days=1, summary_chars=20))
+    assert "- 启动脚本改为等待就绪" in out
+    assert "### Day 1 - 02/02（周一）\n**做了什么**： - 修复 hooks…" in out
+    assert "整理 skills 清单" not in out
+    assert out.index("Day 1") < out.index("Day 2") < out.index("Day 3")
+
+
+def test_budget_is_respected_and_status_comes_first(memory):
+    opts = ic.Options(budget=60, full_days=1)
+    blocks = ic.assemble(memory, ic.source_files(memory, opts), opts)
+    assert blocks[0].id == "status.md"
+    assert sum(ic.estimate_tokens(b.text) for b in blocks) <= 60
+    assert "context.md#Day 3 - 02/04（周三）" in [b.id for b in blocks]
+    assert "context.md#tail" not in [b.id for b in blocks]
+
+
+def test_oversized_status_is_truncated(tmp_path):
+    (tmp_path / "status.md").write_text("\n".join(["- 一条很长的待办事项"] * 200), encoding="utf-8")
+    out = run(tmp_path, ic.Options(budget=100))
+    assert out.rstrip().endswith(ic.TRUNCATED)
+    assert ic.estimate_tokens(out) <= 120
+
+
+def test_about_me_is_opt_in_and_skips_readme(memory):
+    (memory / "about-me").mkdir()
+    (memory / "about-me" / "README.md").write_text("模板说明", encoding="utf-8")
+    (memory / "about-me" / "profile.md").write_text("独立开发者", encoding="utf-8")
+    assert "独立开发者" not in run(memory)
+    out = run(memory, ic.Options(about_me=True))
+    assert "=== 0-System/about-me/profile.md ===" in out
+    assert "模板说明" not in out
+
+
+def test_same_session_gets_nothing_when_unchanged(memory):
+    hook = {"session_id": "s1", "hook_event_name": "UserPromptSubmit"}
+    assert "=== 0-System/status.md ===" in run(memory, hook=hook)
+    assert run(memory, hook=hook) == ""
+
+
+def test_same_session_gets_only_changed_blocks(memory):
+    hook = {"session_id": "s1", "hook_event_name": "UserPromptSubmit"}
+    run(memory, hook=hook)
+    with open(memory / "status.md", "a", encoding="utf-8") as f:
+        f.write("- 新增一条待办\n")
+    out = run(memory, hook=hook)
+    assert out.startswith("[memory]")
+    assert "- 新增一条待办" in out
+    assert "context.md" not in out
+
+
+def test_session_start_and_new_sessions_get_full_context(memory):
+    run(memory, hook={"session_id": "s1", "hook_event_name": "UserPromptSubmit"})
+    full = run(memory)
+    assert run(memory, hook={"session_id": "s1", "hook_event_name": "SessionStart"}) == full
+    assert run(memory, hook={"session_id": "s2", "hook_event_name": "UserPromptSubmit"}) == full
+    assert run(memory, hook={"session_id": "s1"}, full=True) == full
+
+
+def test_unchanged_files_are_served_from_cache(memory, monkeypatch):
+    first = run(memory)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("memory file re-read despite unchanged mtimes")
+
+    monkeypatch.setattr(ic, "assemble", fail)
+    assert run(memory) == first
+
+
+def test_cli_reads_hook_payload_from_stdin(memory, monkeypatch, capsys):
+    payload = json.dumps({"session_id": "s1", "hook_event_name": "UserPromptSubmit"})
+    monkeypatch.setattr("sys.stdin", io.StringIO(payload))
+    assert ic.main(["--root", str(memory), "--budget", "500"]) == 0
+    assert "=== 0-System/context.md ===" in capsys.readouterr().out
+
+    monkeypatch.setattr("sys.stdin", io.StringIO(payload))
+    ic.main(["--root", str(memory), "--budget", "500"])
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,31 @@
+# Shared helpers for start-mycc.ps1 / stop-mycc.ps1
+# Dot-sourced by both scripts; not meant to be run directly.
+
+$PORT = 18080
+
+# PIDs listening on $PORT (empty if the port is free)
+function Get-PortProcessIds {
+    Get-NetTCPConnection -LocalPort $PORT -State Listen -ErrorAction SilentlyContinue |
+        Select-Object -ExpandProperty OwningProcess -Unique
+}
+
+# Force-stop a process and wait until it has actually exited. Windows has
+# no graceful signal the hidden node backend would receive, so there is
+# nothing to wait for before forcing. Returns $true once the process is gone.
+function Stop-ProcessAndWait {
+    param($processId)
+    Stop-Process -Id $processId -Force -ErrorAction SilentlyContinue
+    $deadline = (Get-Date).AddSeconds(3)
+    while ((Get-Process -Id $processId -ErrorAction SilentlyContinue) -and ((Get-Date) -lt $deadline)) {
+        Start-Sleep -Milliseconds 200
+    }
+    return -not (Get-Process -Id $processId -ErrorAction SilentlyContinue)
+}
+
+# Wait (briefly) until nothing is listening on $PORT anymore
+function Wait-PortFree {
+    $deadline = (Get-Date).AddSeconds(3)
+    while ((Get-PortProcessIds) -and ((Get-Date) -lt $deadline)) {
+        Start-Sleep -Milliseconds 200
+    }
+}
@@ -0,0 +1,47 @@
+#!/bin/bash
+# Shared helpers for start-mycc.sh / stop-mycc.sh
+# Sourced after the caller defines its colors; not meant to be run directly.
+
+PORT=18080
+STOP_TIMEOUT=10  # seconds to wait after SIGTERM before escalating to SIGKILL
+
+# PIDs listening on $PORT, one per line (empty if the port is free)
+port_pids() {
+    lsof -Pi :$PORT -sTCP:LISTEN -t 2>/dev/null | sort -u
+}
+
+# Subset of the given PIDs that are still running
+alive_pids() {
+    local pid
+    for pid in "$@"; do
+        kill -0 "$pid" 2>/dev/null && echo "$pid"
+    done
+    return 0
+}
+
+# Stop every process listening on $PORT. SIGTERM gives the process a chance
+# to exit cleanly (draining open SSE streams is up to the backend's own
+# handler); anything still alive after STOP_TIMEOUT gets SIGKILL. Returns
+# once the port is released or a short grace period has passed.
+stop_port() {
+    local pids deadline
+    pids=$(port_pids)
+    [ -n "$pids" ] || return 0
+
+    kill -TERM $pids 2>/dev/null || true
+    deadline=$((SECONDS + STOP_TIMEOUT))
+    while [ -n "$(alive_pids $pids)" ] && [ $SECONDS -lt $deadline ]; do
+        sleep 0.2
+    done
+
+    pids=$(alive_pids $pids)
+    if [ -n "$pids" ]; then
+        echo -e "  ${YELLOW}Still running after ${STOP_TIMEOUT}s, forcing...${NC}"
+        kill -9 $pids 2>/dev/null || true
+    fi
+
+    deadline=$((SECONDS + 3))
+    while [ -n "$(port_pids)" ] && [ $SECONDS -lt $deadline ]; do
+        sleep 0.2
+    done
+}
@@ -12,6 +12,7 @@ $LOG_FILE = "$PROJECT_DIR\.claude\skills\mycc\backend.log"
 $CONFIG_FILE = "$PROJECT_DIR\.claude\skills\mycc\current.json"
 $TSX_BIN = "$SCRIPT_DIR\node_modules\.bin\tsx"
 $ENV_FILE = "$PROJECT_DIR\.env"
+$READY_TIMEOUT = 45  # seconds to wait for tunnel + Worker registration
 
 # Load .env file if exists
 if (Test-Path $ENV_FILE) {
@@ -27,6 +28,37 @@ if (Test-Path $ENV_FILE) {
     }
 }
 
+# $PORT, Get-PortProcessIds, Stop-ProcessAndWait, Wait-PortFree
+. "$PSScriptRoot\mycc-common.ps1"
+$READY_URL = "http://127.0.0.1:$PORT/readyz"
+
+# current.json is only trusted once written by this run
+function Test-ConfigFresh {
+    param($startedAt)
+    (Test-Path $CONFIG_FILE) -and ((Get-Item $CONFIG_FILE).LastWriteTime -ge $startedAt)
+}
+
+# Ready when current.json is fresh and the backend answers /readyz;
+# backends without the endpoint are ready once the file has all
+# connection fields.
+function Test-Ready {
+    param($startedAt)
+    if (-not (Test-ConfigFresh -startedAt $startedAt)) { return $false }
+    try {
+        $resp = Invoke-WebRequest -Uri $READY_URL -UseBasicParsing -TimeoutSec 1 -ErrorAction Stop
+        if ($resp.StatusCode -eq 200) { return $true }
+    } catch {
+        # Not listening yet, or no /readyz endpoint
+    }
+    try {
+        $config = Get-Content $CONFIG_FILE -Raw | ConvertFrom-Json
+        return [bool]($config.routeToken -and $config.pairCode -and $config.tunnelUrl)
+    } catch {
+        # Config not ready yet
+        return $false
+    }
+}
+
 Clear-Host
 
 Write-Host ""
@@ -69,17 +101,17 @@ Write-Host "  Feishu Group ID: $env:FEISHU_RECEIVE_USER_ID" -ForegroundColor Gra
 Write-Host ""
 
 # Check and stop existing process
-Write-Host "[2/5] Checking port 18080..." -ForegroundColor Yellow
-$existingProcess = Get-NetTCPConnection -LocalPort 18080 -ErrorAction SilentlyContinue |
-                    Where-Object State -eq "Listen" |
-                    Select-Object -ExpandProperty OwningProcess -ErrorAction SilentlyContinue
+Write-Host "[2/5] Checking port $PORT..." -ForegroundColor Yellow
+$existingProcess = Get-PortProcessIds
 
 if ($existingProcess) {
-    Write-Host "  Port occupied (PID: $existingProcess), stopping..." -ForegroundColor Red
-    Stop-Process -Id $existingProcess -Force -ErrorAction SilentlyContinue
-    Start-Sleep -Seconds 2
+    foreach ($processId in @($existingProcess)) {
+        Write-Host "  Port occupied (PID: $processId), stopping..." -ForegroundColor Red
+        Stop-ProcessAndWait -processId $processId | Out-Null
+    }
+    Wait-PortFree
 }
-Write-Host "  Port 18080 available" -ForegroundColor Green
+Write-Host "  Port $PORT available" -ForegroundColor Green
 Write-Host ""
 
 # Start backend
@@ -113,49 +145,29 @@ Set objShell = Nothing
 Set-Content -Path $vbsFile -Value $vbsContent -Encoding ASCII
 
 # Start hidden process
+$startedAt = Get-Date
 Start-Process -FilePath "wscript.exe" -ArgumentList $vbsFile -WindowStyle Hidden
-
-# Wait for process to start
-Start-Sleep -Seconds 3
-
-# Check if port 18080 is now listening
-$portProcess = Get-NetTCPConnection -LocalPort 18080 -ErrorAction SilentlyContinue |
-               Where-Object State -eq "Listen" |
-               Select-Object -ExpandProperty OwningProcess -ErrorAction SilentlyContinue
-
-if ($portProcess) {
-    Write-Host "  Backend started (PID: $portProcess)" -ForegroundColor Green
-} else {
-    Write-Host "  WARNING: Port 18080 not listening yet" -ForegroundColor Yellow
-}
+Write-Host "  Backend launched" -ForegroundColor Green
 
 Write-Host ""
 
-# Wait for config file
+# Block on readiness: the backend binds HTTP, starts cloudflared and
+# registers with the Worker on its own, so just poll until it says so.
 Write-Host "[4/5] Waiting for service ready..." -ForegroundColor Yellow
-$timeout = 45
-$elapsed = 0
-while ($elapsed -lt $timeout) {
-    if (Test-Path $CONFIG_FILE) {
-        try {
-            $config = Get-Content $CONFIG_FILE -Raw | ConvertFrom-Json
-            if ($config.routeToken -and $config.pairCode -and $config.tunnelUrl) {
-                break
-            }
-        } catch {
-            # Config not ready yet
-        }
+$deadline = $startedAt.AddSeconds($READY_TIMEOUT)
+$ready = $false
+while ((Get-Date) -lt $deadline) {
+    if (Test-Ready -startedAt $startedAt) {
+        $ready = $true
+        break
     }
-    Start-Sleep -Seconds 1
-    $elapsed++
-    Write-Host "  Waiting... ($elapsed/$timeout sec)" -NoNewline
-    Write-Host "`r" -NoNewline
+    Start-Sleep -Milliseconds 200
 }
 
 Write-Host ""
 
 # Check if started successfully
-if (-not (Test-Path $CONFIG_FILE)) {
+if (-not $ready -or -not (Test-ConfigFresh -startedAt $startedAt)) {
     Write-Host ""
     Write-Host "  ERROR: Startup timeout!" -ForegroundColor Red
     Write-Host "  Check log: Get-Content '$LOG_FILE' -Tail 50" -ForegroundColor Gray
@@ -163,6 +175,8 @@ if (-not (Test-Path $CONFIG_FILE)) {
     Read-Host "Press Enter to exit"
     exit 1
 }
+$readySeconds = [Math]::Round(((Get-Date) - $startedAt).TotalSeconds, 1)
+Write-Host "  Ready in $readySeconds s" -ForegroundColor Green
 
 # Read connection info
 $config = Get-Content $CONFIG_FILE -Raw | ConvertFrom-Json
@@ -214,7 +228,7 @@ Write-Host "  Stop service:" -ForegroundColor Gray
 Write-Host "    .\stop-mycc.ps1" -ForegroundColor DarkGray
 Write-Host ""
 Write-Host "  Or kill by port:" -ForegroundColor Gray
-Write-Host "    netstat -ano | findstr :18080" -ForegroundColor DarkGray
+Write-Host "    netstat -ano | findstr :$PORT" -ForegroundColor DarkGray
 Write-Host "    taskkill /PID <pid> /F" -ForegroundColor DarkGray
 Write-Host ""
 Write-Host "============================================" -ForegroundColor Cyan
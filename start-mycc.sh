@@ -11,6 +11,7 @@ LOG_FILE="$PROJECT_DIR/.claude/skills/mycc/backend.log"
 CONFIG_FILE="$PROJECT_DIR/.claude/skills/mycc/current.json"
 ENV_FILE="$PROJECT_DIR/.env"
 TSX_BIN="$SCRIPT_DIR/node_modules/.bin/tsx"
+READY_TIMEOUT=45  # seconds to wait for tunnel + Worker registration
 
 # Load .env file if exists
 if [ -f "$ENV_FILE" ]; then
@@ -26,6 +27,35 @@ GRAY='\033[0;37m'
 WHITE='\033[1;37m'
 NC='\033[0m' # No Color
 
+# PORT, STOP_TIMEOUT, port_pids and stop_port
+source "$PROJECT_DIR/mycc-common.sh"
+READY_URL="http://127.0.0.1:$PORT/readyz"
+
+# current.json is only trusted once written by this run (not older than
+# the start marker; -nt can be whole-second on bash 3.2 / HFS+)
+config_fresh() {
+    [ -f "$CONFIG_FILE" ] && [ ! "$START_MARKER" -nt "$CONFIG_FILE" ]
+}
+
+# Ready when current.json is fresh and the backend answers /readyz;
+# backends without the endpoint are ready once the file has all
+# connection fields.
+is_ready() {
+    config_fresh || return 1
+    if command -v curl &> /dev/null && curl -fsS -m 1 "$READY_URL" >/dev/null 2>&1; then
+        return 0
+    fi
+    if command -v jq &> /dev/null; then
+        [ -n "$(jq -r '.routeToken // empty' "$CONFIG_FILE" 2>/dev/null)" ] && \
+        [ -n "$(jq -r '.pairCode // empty' "$CONFIG_FILE" 2>/dev/null)" ] && \
+        [ -n "$(jq -r '.tunnelUrl // empty' "$CONFIG_FILE" 2>/dev/null)" ]
+    else
+        grep -q '"routeToken"' "$CONFIG_FILE" && \
+        grep -q '"pairCode"' "$CONFIG_FILE" && \
+        grep -q '"tunnelUrl"' "$CONFIG_FILE"
+    fi
+}
+
 clear
 
 echo ""
@@ -70,14 +100,13 @@ fi
 echo ""
 
 # Check and stop existing process
-echo -e "${YELLOW}[2/5] Checking port 18080...${NC}"
-if lsof -Pi :18080 -sTCP:LISTEN -t >/dev/null 2>&1; then
-    PID=$(lsof -Pi :18080 -sTCP:LISTEN -t)
-    echo -e "  ${RED}Port occupied (PID: $PID), stopping...${NC}"
-    kill -9 "$PID" 2>/dev/null || true
-    sleep 2
+echo -e "${YELLOW}[2/5] Checking port $PORT...${NC}"
+PIDS=$(port_pids)
+if [ -n "$PIDS" ]; then
+    echo -e "  ${RED}Port occupied (PID: $(echo $PIDS)), stopping...${NC}"
+    stop_port
 fi
-echo -e "  ${GREEN}Port 18080 available${NC}"
+echo -e "  ${GREEN}Port $PORT available${NC}"
 echo ""
 
 # Start backend
@@ -86,61 +115,50 @@ echo -e "${YELLOW}[3/5] Starting backend...${NC}"
 # Clear old log
 [ -f "$LOG_FILE" ] && rm -f "$LOG_FILE"
 
+# Marks the start time so a stale current.json from the last run is ignored
+START_MARKER=$(mktemp)
+trap 'rm -f "$START_MARKER"' EXIT
+
 # Start in background using nohup
+LAUNCHED_AT=$SECONDS
 nohup "$TSX_BIN" "$SCRIPT_DIR/src/index.ts" start >> "$LOG_FILE" 2>&1 &
 BACKEND_PID=$!
 
-# Wait for process to start
-sleep 3
-
-# Check if port 18080 is now listening
-if lsof -Pi :18080 -sTCP:LISTEN -t >/dev/null 2>&1; then
-    NEW_PID=$(lsof -Pi :18080 -sTCP:LISTEN -t)
-    echo -e "  ${GREEN}Backend started (PID: $NEW_PID)${NC}"
-else
-    echo -e "  ${YELLOW}WARNING: Port 18080 not listening yet${NC}"
-fi
-
+echo -e "  ${GREEN}Backend launched (PID: $BACKEND_PID)${NC}"
 echo ""
 
-# Wait for config file
+# Block on readiness: the backend binds HTTP, starts cloudflared and
+# registers with the Worker on its own, so just poll until it says so.
 echo -e "${YELLOW}[4/5] Waiting for service ready...${NC}"
-timeout=45
-elapsed=0
-while [ $elapsed -lt $timeout ]; do
-    if [ -f "$CONFIG_FILE" ]; then
-        if command -v jq &> /dev/null; then
-            routeToken=$(jq -r '.routeToken // empty' "$CONFIG_FILE" 2>/dev/null)
-            pairCode=$(jq -r '.pairCode // empty' "$CONFIG_FILE" 2>/dev/null)
-            tunnelUrl=$(jq -r '.tunnelUrl // empty' "$CONFIG_FILE" 2>/dev/null)
-            if [ -n "$routeToken" ] && [ -n "$pairCode" ] && [ -n "$tunnelUrl" ]; then
-                break
-            fi
-        else
-            # Fallback: grep
-            if grep -q '"routeToken"' "$CONFIG_FILE" && \
-               grep -q '"pairCode"' "$CONFIG_FILE" && \
-               grep -q '"tunnelUrl"' "$CONFIG_FILE"; then
-                break
-            fi
-        fi
+deadline=$((SECONDS + READY_TIMEOUT))
+ready=false
+while [ $SECONDS -lt $deadline ]; do
+    if is_ready; then
+        ready=true
+        break
     fi
-    sleep 1
-    elapsed=$((elapsed + 1))
-    echo -ne "  Waiting... ($elapsed/$timeout sec)\r"
+    if ! kill -0 "$BACKEND_PID" 2>/dev/null; then
+        break
+    fi
+    sleep 0.2
 done
 
 echo ""
 
 # Check if started successfully
-if [ ! -f "$CONFIG_FILE" ]; then
+if [ "$ready" != true ] || ! config_fresh; then
     echo ""
-    echo -e "  ${RED}ERROR: Startup timeout!${NC}"
+    if kill -0 "$BACKEND_PID" 2>/dev/null; then
+        echo -e "  ${RED}ERROR: Startup timeout!${NC}"
+    else
+        echo -e "  ${RED}ERROR: Backend exited during startup!${NC}"
+    fi
     echo -e "  ${GRAY}Check log: tail -50 '$LOG_FILE'${NC}"
     echo ""
     read -p "Press Enter to exit"
     exit 1
 fi
+echo -e "  ${GREEN}Ready in $((SECONDS - LAUNCHED_AT))s${NC}"
 
 # Read connection info
 echo ""
@@ -3,6 +3,9 @@
 $PROJECT_DIR = "E:\AI\mycc\AImycc"
 $PID_FILE = "$PROJECT_DIR\.claude\skills\mycc\backend.pid"
 
+# $PORT, Get-PortProcessIds, Stop-ProcessAndWait, Wait-PortFree
+. "$PSScriptRoot\mycc-common.ps1"
+
 Write-Host ""
 Write-Host "============================================" -ForegroundColor Red
 Write-Host "       Stop MyCC Backend Service" -ForegroundColor Red
@@ -26,12 +29,7 @@ function Stop-BackendProcess {
         if ($process) {
             Write-Host "  Found process: $processId ($($process.ProcessName)) from $source" -ForegroundColor Cyan
             Write-Host "  Stopping..." -ForegroundColor Yellow
-            Stop-Process -Id $processId -Force -ErrorAction SilentlyContinue
-            Start-Sleep -Seconds 1
-
-            # Check if still running
-            $stillRunning = Get-Process -Id $processId -ErrorAction SilentlyContinue
-            if (-not $stillRunning) {
+            if (Stop-ProcessAndWait -processId $processId) {
                 Write-Host "  Service stopped successfully" -ForegroundColor Green
 
                 # Remove PID file
@@ -54,20 +52,22 @@ function Stop-BackendProcess {
 $stopped = $false
 if ($pidFromFile) {
     Write-Host "[1/2] Checking saved PID..." -ForegroundColor Yellow
-    $stopped = Stop-BackendProcess -pid $pidFromFile -source "PID file"
+    $stopped = Stop-BackendProcess -processId $pidFromFile -source "PID file"
 }
 
 # 2. Fallback to port check
 if (-not $stopped) {
-    Write-Host "[2/2] Checking port 18080..." -ForegroundColor Yellow
-    $portProcess = Get-NetTCPConnection -LocalPort 18080 -ErrorAction SilentlyContinue |
-                   Where-Object State -eq "Listen" |
-                   Select-Object -ExpandProperty OwningProcess -ErrorAction SilentlyContinue
+    Write-Host "[2/2] Checking port $PORT..." -ForegroundColor Yellow
+    $portProcess = Get-PortProcessIds
 
     if ($portProcess) {
-        $stopped = Stop-BackendProcess -pid $portProcess -source "port 18080"
+        $stopped = $true
+        foreach ($processId in @($portProcess)) {
+            $stopped = (Stop-BackendProcess -processId $processId -source "port $PORT") -and $stopped
+        }
+        Wait-PortFree
     } else {
-        Write-Host "  Port 18080 is free, service not running" -ForegroundColor Green
+        Write-Host "  Port $PORT is free, service not running" -ForegroundColor Green
         $stopped = $true
     }
 }
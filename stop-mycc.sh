@@ -17,28 +17,35 @@ echo ""
 
 PROJECT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 
+# PORT, STOP_TIMEOUT, port_pids and stop_port
+source "$PROJECT_DIR/mycc-common.sh"
+
 # Stop by port
-echo -e "${YELLOW}Stopping backend on port 18080...${NC}"
+echo -e "${YELLOW}Stopping backend on port $PORT...${NC}"
 
-if lsof -Pi :18080 -sTCP:LISTEN -t >/dev/null 2>&1; then
-    PID=$(lsof -Pi :18080 -sTCP:LISTEN -t)
-    echo -e "  ${CYAN}Killing process $PID...${NC}"
-    kill -9 "$PID" 2>/dev/null || true
-    sleep 1
+PIDS=$(port_pids)
+if [ -n "$PIDS" ]; then
+    echo -e "  ${CYAN}Stopping process $(echo $PIDS)...${NC}"
+    stop_port
 
-    if lsof -Pi :18080 -sTCP:LISTEN -t >/dev/null 2>&1; then
+    if [ -n "$(port_pids)" ]; then
         echo -e "  ${RED}Failed to stop process${NC}"
     else
         echo -e "  ${GREEN}✓ Backend stopped${NC}"
     fi
 else
-    echo -e "  ${YELLOW}No process found on port 18080${NC}"
+    echo -e "  ${YELLOW}No process found on port $PORT${NC}"
 fi
 
-# Kill cloudflared processes
+# Stop leftover cloudflared processes, giving them a moment to close the tunnel
 echo ""
 echo -e "${YELLOW}Stopping cloudflared processes...${NC}"
 if pgrep -f "cloudflared tunnel" >/dev/null 2>&1; then
+    pkill -TERM -f "cloudflared tunnel" 2>/dev/null || true
+    deadline=$((SECONDS + 3))
+    while pgrep -f "cloudflared tunnel" >/dev/null 2>&1 && [ $SECONDS -lt $deadline ]; do
+        sleep 0.2
+    done
     pkill -9 -f "cloudflared tunnel" 2>/dev/null || true
     echo -e "  ${GREEN}✓ Cloudflared stopped${NC}"
 else